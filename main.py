@@ -6,6 +6,8 @@ import pygame
 import random
 import sys
 import os
+import math
+import numpy as np
 from collections import deque
 
 # ---------------- CONFIG ----------------
@@ -13,6 +15,7 @@ WIDTH, HEIGHT = 900, 600
 TILE = 40
 FPS = 60
 MAX_LEVEL = 5
+FLOW_REFRESH = 10   # frames between rebuilds of the HOD's path field
 ASSETS_DIR = "assets"
 BG_IMG_PATH = None
 
@@ -27,12 +30,27 @@ GOLD = (255,215,0)
 
 pygame.mixer.pre_init(44100, -16, 2, 512)
 pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# let SDL's renderer present frames on vsync instead of blitting in software.
+# Without a fast renderer (e.g. the dummy driver) SDL only warns and returns a
+# plain software surface without SCALED; the except covers drivers that refuse
+try:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED | pygame.DOUBLEBUF, vsync=1)
+except pygame.error:
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Campus Maze — Improved")
 clock = pygame.time.Clock()
 font = pygame.font.SysFont("Arial", 20)
 big_font = pygame.font.SysFont("Arial", 48, bold=True)
 
+# tile images shared by every wall / gate instead of being rebuilt per tile
+WALL_IMAGE = pygame.Surface((TILE, TILE)).convert()
+WALL_IMAGE.fill(WALL_SIDE)
+pygame.draw.rect(WALL_IMAGE, WALL_TOP, (0,0,TILE,TILE-12))
+
+GATE_IMAGE = pygame.Surface((TILE, TILE)).convert()
+GATE_IMAGE.fill(GOLD)
+pygame.draw.rect(GATE_IMAGE, (200,180,0), (4,4,TILE-8,TILE-8), 3)
+
 # ---------------- HELPERS ----------------
 def load_image(name, fallback_color=(120,120,120), size=(32,32)):
     path = os.path.join(ASSETS_DIR, name)
@@ -40,7 +58,7 @@ def load_image(name, fallback_color=(120,120,120), size=(32,32)):
         img = pygame.image.load(path).convert_alpha()
         return pygame.transform.scale(img, size)
     except Exception:
-        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
         surf.fill(fallback_color)
         return surf
 
@@ -51,6 +69,16 @@ def load_sound(name):
     except:
         return None
 
+def hits_wall(rect, row_masks):
+    # bit c of row_masks[r] is set when tile (c, r) is a wall, so each row the
+    # rect overlaps is tested with a single and against its column span
+    cmin = rect.left // TILE
+    span = (1 << ((rect.right-1) // TILE - cmin + 1)) - 1
+    for r in range(rect.top // TILE, (rect.bottom-1) // TILE + 1):
+        if (row_masks[r] >> cmin) & span:
+            return True
+    return False
+
 # ---------------- NEW MAZE GENERATOR ----------------
 # Full grid-perfect maze using DFS with clean alignment
 
@@ -59,15 +87,10 @@ def generate_maze(cols, rows):
     if cols % 2 == 0: cols += 1
     if rows % 2 == 0: rows += 1
 
-    maze = [[1 for _ in range(cols)] for _ in range(rows)]
-
-    def neighbors(cx, cy):
-        dirs = [(0,2),(0,-2),(2,0),(-2,0)]
-        random.shuffle(dirs)
-        for dx, dy in dirs:
-            nx, ny = cx+dx, cy+dy
-            if 1 <= nx < cols-1 and 1 <= ny < rows-1:
-                yield nx, ny, dx, dy
+    # carve on plain lists (cheap per-cell access from Python) and hand back
+    # a numpy array once the maze is done
+    maze = [[1]*cols for _ in range(rows)]
+    dirs = [(0,2),(0,-2),(2,0),(-2,0)]
 
     stack = [(1,1)]
     maze[1][1] = 0
@@ -76,8 +99,10 @@ def generate_maze(cols, rows):
         x, y = stack[-1]
         carved = False
 
-        for nx, ny, dx, dy in neighbors(x,y):
-            if maze[ny][nx] == 1:
+        random.shuffle(dirs)
+        for dx, dy in dirs:
+            nx, ny = x+dx, y+dy
+            if 1 <= nx < cols-1 and 1 <= ny < rows-1 and maze[ny][nx] == 1:
                 maze[y + dy//2][x + dx//2] = 0
                 maze[ny][nx] = 0
                 stack.append((nx,ny))
@@ -89,24 +114,39 @@ def generate_maze(cols, rows):
 
     # ensure exit
     maze[rows-2][cols-2] = 0
-    return maze
+    return np.array(maze, dtype=np.uint8)
+
+# ---------------- HOD PATH FIELD ----------------
+# flow[r, c] indexes FLOW_DIRS with the step that leads one tile closer to the
+# player; 0 means no step (the player's own tile, walls, unreachable tiles)
+FLOW_DIRS = ((0,0),(1,0),(-1,0),(0,1),(0,-1))
+
+def build_flow(grid, start, flow):
+    cells = grid.tolist()   # doubles as the visited set
+    rows, cols = grid.shape
+    flow.fill(0)
+
+    sc, sr = start
+    cells[sr][sc] = 1
+    queue = deque([start])
+
+    while queue:
+        c, r = queue.popleft()
+        for d in range(1, 5):
+            dx, dy = FLOW_DIRS[d]
+            # the neighbour that reaches (c, r) by stepping (dx, dy)
+            nc, nr = c-dx, r-dy
+            if 0 <= nr < rows and 0 <= nc < cols and not cells[nr][nc]:
+                cells[nr][nc] = 1
+                flow[nr, nc] = d
+                queue.append((nc, nr))
 
 # ---------------- SPRITES ----------------
-class Wall(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((TILE, TILE))
-        self.image.fill(WALL_SIDE)
-        pygame.draw.rect(self.image, WALL_TOP, (0,0,TILE,TILE-12))
-        self.rect = self.image.get_rect(topleft=(x,y))
-
 class Gate(pygame.sprite.Sprite):
     def __init__(self, x, y):
         super().__init__()
-        self.image = pygame.Surface((TILE, TILE))
-        self.image.fill(GOLD)
-        pygame.draw.rect(self.image, (200,180,0), (4,4,TILE-8,TILE-8), 3)
-        self.rect = self.image.get_rect(topleft=(x,y))
+        self.image = GATE_IMAGE
+        self.rect = GATE_IMAGE.get_rect(topleft=(x,y))
 
 class Note(pygame.sprite.Sprite):
     def __init__(self, x, y):
@@ -128,31 +168,34 @@ class Player(pygame.sprite.Sprite):
         self.base_speed = 3.5
         self.speed = self.base_speed
         self.name = name
+        self.name_tag = font.render(name, True, WHITE)
         self.gender = gender
         self.lives = 3
         self.score = 0
         self.boost_timer = 0
 
-    def move_axis(self, dx, dy, walls):
-        self.rect.x += dx
-        for w in walls:
-            if self.rect.colliderect(w.rect):
-                if dx > 0: self.rect.right = w.rect.left
-                if dx < 0: self.rect.left = w.rect.right
-
-        self.rect.y += dy
-        for w in walls:
-            if self.rect.colliderect(w.rect):
-                if dy > 0: self.rect.bottom = w.rect.top
-                if dy < 0: self.rect.top = w.rect.bottom
-
-    def update(self, keys, walls):
+    def move_axis(self, dx, dy, row_masks):
+        # move_ip truncates floats; floor(d + 0.5) reproduces the rounding the
+        # old rect.x += dx setter applied (4 px right/down, 3 px left/up at 3.5)
+        if dx:
+            self.rect.move_ip(math.floor(dx + 0.5), 0)
+            if hits_wall(self.rect, row_masks):
+                if dx > 0: self.rect.right = (self.rect.right-1) // TILE * TILE
+                if dx < 0: self.rect.left = (self.rect.left // TILE + 1) * TILE
+
+        if dy:
+            self.rect.move_ip(0, math.floor(dy + 0.5))
+            if hits_wall(self.rect, row_masks):
+                if dy > 0: self.rect.bottom = (self.rect.bottom-1) // TILE * TILE
+                if dy < 0: self.rect.top = (self.rect.top // TILE + 1) * TILE
+
+    def update(self, keys, row_masks):
         dx = dy = 0
         if keys[pygame.K_LEFT]: dx = -self.speed
         if keys[pygame.K_RIGHT]: dx = self.speed
         if keys[pygame.K_UP]: dy = -self.speed
         if keys[pygame.K_DOWN]: dy = self.speed
-        self.move_axis(dx, dy, walls)
+        self.move_axis(dx, dy, row_masks)
 
         if self.boost_timer > 0:
             self.boost_timer -= 1
@@ -171,18 +214,29 @@ class HOD(pygame.sprite.Sprite):
         self.base_speed = 1.0
         self.speed = self.base_speed
 
-    def update(self, target, walls, level):
+    def update(self, target, flow, row_masks, level):
         self.speed = self.base_speed + 0.12*(level-1)
-        dx = 1 if self.rect.centerx < target.centerx else -1
-        dy = 1 if self.rect.centery < target.centery else -1
 
-        self.rect.x += dx*self.speed
-        for w in walls:
-            if self.rect.colliderect(w.rect): self.rect.x -= dx*self.speed
+        # head for the centre of the next tile on the path, or straight at
+        # the player once we share a tile with them
+        c, r = self.rect.centerx // TILE, self.rect.centery // TILE
+        d = flow[r, c]
+        if d:
+            tx = (c + FLOW_DIRS[d][0])*TILE + TILE//2
+            ty = (r + FLOW_DIRS[d][1])*TILE + TILE//2
+        else:
+            tx, ty = target.center
+
+        dx = max(-self.speed, min(self.speed, tx - self.rect.centerx))
+        dy = max(-self.speed, min(self.speed, ty - self.rect.centery))
 
-        self.rect.y += dy*self.speed
-        for w in walls:
-            if self.rect.colliderect(w.rect): self.rect.y -= dy*self.speed
+        x = self.rect.x
+        self.rect.x += dx
+        if hits_wall(self.rect, row_masks): self.rect.x = x
+
+        y = self.rect.y
+        self.rect.y += dy
+        if hits_wall(self.rect, row_masks): self.rect.y = y
 
 # ---------------- GAME ----------------
 class Game:
@@ -192,65 +246,91 @@ class Game:
         self.player_name = 'Player'
         self.gender = 'Male'
 
-        self.walls = pygame.sprite.Group()
+        self.grid = None
+        self.row_masks = None
+        self.flow = None
+        self.frame = 0
+        self.wall_surface = None
+        self.view = screen.get_rect()
         self.notes = pygame.sprite.Group()
-        self.hod_group = pygame.sprite.Group()
-        self.all_sprites = pygame.sprite.Group()
+        self.notes_list = []
+        self.note_rects = []
 
         self.snd_bell = load_sound('bell.wav')
         self.snd_caught = load_sound('caught.wav')
         self.snd_foot = load_sound('footstep.wav')
 
+        # backgrounds are opaque: a plain convert() matches the display format
         self.bg = None
+        if BG_IMG_PATH:
+            try:
+                img = pygame.image.load(os.path.join(ASSETS_DIR, BG_IMG_PATH))
+                self.bg = pygame.transform.scale(img, (WIDTH, HEIGHT)).convert()
+            except Exception:
+                self.bg = None
+        self._hud_cache = (None, None)
+        self.hit_text = font.render("You were caught! Press ENTER", True, WHITE)
+        self.clear_text = font.render("Level Clear! Press ENTER", True, WHITE)
 
     def start_level(self, level):
-        self.walls.empty(); self.notes.empty(); self.hod_group.empty(); self.all_sprites.empty()
+        self.notes.empty()
 
         cols = WIDTH // TILE
         rows = HEIGHT // TILE
         grid = generate_maze(cols, rows)
+        self.grid = grid
+        self.row_masks = [sum(1 << c for c in np.flatnonzero(row).tolist()) for row in grid]
+        self.flow = np.zeros(grid.shape, dtype=np.uint8)
+        self.frame = 0
+
+        # walls never move, so render them once (over the background) into a
+        # single surface
+        self.wall_surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+        if self.bg:
+            self.wall_surface.blit(self.bg, (0,0))
+        else:
+            self.wall_surface.fill(FLOOR)
 
-        free_tiles = []
-        for r in range(rows):
-            for c in range(cols):
-                x, y = c*TILE, r*TILE
-                if grid[r][c] == 1:
-                    w = Wall(x,y)
-                    self.walls.add(w)
-                    self.all_sprites.add(w)
-                else:
-                    free_tiles.append((x,y))
+        walls_rc = np.argwhere(grid == 1)
+        free_rc = np.argwhere(grid == 0)
+        wall_xy = (walls_rc[:, ::-1] * TILE).tolist()
+        self.wall_surface.blits([(WALL_IMAGE, (x,y)) for x, y in wall_xy], False)
+        free_tiles = (free_rc[:, ::-1] * TILE).tolist()
 
         start = free_tiles[0]
         end = free_tiles[-1]
 
         self.player = Player(self.player_name, self.gender, start[0]+4, start[1]+4)
-        self.all_sprites.add(self.player)
-
         self.gate = Gate(end[0], end[1])
-        self.all_sprites.add(self.gate)
 
         mid = free_tiles[len(free_tiles)//2]
         self.hod = HOD(mid[0], mid[1])
-        self.hod_group.add(self.hod)
-        self.all_sprites.add(self.hod)
 
-        for _ in range(6 + level*2):
-            px, py = random.choice(free_tiles)
-            n = Note(px, py)
-            self.notes.add(n)
-            self.all_sprites.add(n)
+        note_count = 6 + level*2
+        for px, py in random.sample(free_tiles, min(note_count, len(free_tiles))):
+            self.notes.add(Note(px, py))
+        self.notes_list = self.notes.sprites()
+        self.note_rects = [n.rect for n in self.notes_list]
 
         self.state = 'PLAY'
 
     def update(self, keys):
         if self.state == 'PLAY':
-            self.player.update(keys, self.walls.sprites())
-            self.hod.update(self.player.rect, self.walls.sprites(), self.level)
-
-            for n in pygame.sprite.spritecollide(self.player, self.notes, True):
-                self.player.score += 100
-                self.player.boost()
+            self.player.update(keys, self.row_masks)
+            if self.frame % FLOW_REFRESH == 0:
+                p = self.player.rect.center
+                build_flow(self.grid, (p[0]//TILE, p[1]//TILE), self.flow)
+            self.frame += 1
+            self.hod.update(self.player.rect, self.flow, self.row_masks, self.level)
+
+            hits = self.player.rect.collidelistall(self.note_rects)
+            if hits:
+                for i in hits:
+                    self.notes_list[i].kill()
+                    self.player.score += 100
+                    self.player.boost()
+                self.notes_list = self.notes.sprites()
+                self.note_rects = [n.rect for n in self.notes_list]
 
             if pygame.sprite.collide_rect(self.player, self.hod):
                 self.player.lives -= 1
@@ -266,18 +346,25 @@ class Game:
                 self.state = 'LEVELCLEAR'
 
     def draw(self):
-        screen.fill(FLOOR)
-        self.walls.draw(screen)
-        self.notes.draw(screen)
-        screen.blit(self.gate.image, self.gate.rect)
-        screen.blit(self.player.image, self.player.rect)
-        screen.blit(self.hod.image, self.hod.rect)
-
-        tag = font.render(self.player.name, True, WHITE)
+        # only blit what falls inside the window
+        screen.blit(self.wall_surface, (0,0), self.view)
+        visible = self.view.collidelistall(self.note_rects)
+        screen.blits([(self.notes_list[i].image, self.note_rects[i]) for i in visible], False)
+        screen.blits((
+            (self.gate.image, self.gate.rect),
+            (self.player.image, self.player.rect),
+            (self.hod.image, self.hod.rect),
+        ), False)
+
+        tag = self.player.name_tag
         screen.blit(tag, (self.player.rect.centerx-tag.get_width()//2, self.player.rect.top-18))
 
-        hud = font.render(f"Score:{self.player.score}  Lvl:{self.level}  Lives:{self.player.lives}", True, WHITE)
-        screen.blit(hud, (8,8))
+        # only re-render the HUD text when one of its values changes
+        key = (self.player.score, self.level, self.player.lives)
+        if self._hud_cache[0] != key:
+            hud = font.render(f"Score:{self.player.score}  Lvl:{self.level}  Lives:{self.player.lives}", True, WHITE)
+            self._hud_cache = (key, hud)
+        screen.blit(self._hud_cache[1], (8,8))
 
     def title_screen(self):
         screen.fill(BLACK)
@@ -345,13 +432,11 @@ def main():
 
         elif game.state == 'HIT':
             screen.fill(BLACK)
-            t = font.render("You were caught! Press ENTER", True, WHITE)
-            screen.blit(t, (260,260))
+            screen.blit(game.hit_text, (260,260))
 
         elif game.state == 'LEVELCLEAR':
             screen.fill(BLACK)
-            t = font.render("Level Clear! Press ENTER", True, WHITE)
-            screen.blit(t, (260,260))
+            screen.blit(game.clear_text, (260,260))
 
         elif game.state == 'GAMEOVER':
             game.gameover_screen()